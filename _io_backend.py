@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Backend I/O opsional berbasis io_uring untuk Linux.
+
+Jika paket `liburing` terpasang (dan platformnya Linux), baca/tulis berkas
+besar dilakukan lewat ring kecil (queue depth 8) sehingga overhead syscall
+dan context switch turun. Di platform lain — atau bila liburing tidak ada —
+semua fungsi jatuh kembali ke open() biasa, jadi modul ini aman diimpor
+di mana saja.
+"""
+import itertools
+import os
+import sys
+from typing import Iterable
+
+try:
+    import liburing  # type: ignore
+except Exception:
+    liburing = None
+
+_HAVE_URING = liburing is not None and sys.platform.startswith("linux")
+
+_QUEUE_DEPTH = 8
+_CHUNK = 1 << 20  # 1 MB per request
+
+
+def _read_uring(path: str) -> bytes:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        out = bytearray(size)
+        ring = liburing.io_uring()
+        liburing.io_uring_queue_init(_QUEUE_DEPTH, ring, 0)
+        try:
+            offset = 0
+            while offset < size:
+                # isi ring dengan maksimal _QUEUE_DEPTH request sekaligus
+                batch = []
+                batch_bytes = 0
+                while offset < size and len(batch) < _QUEUE_DEPTH:
+                    n = min(_CHUNK, size - offset)
+                    batch_bytes += n
+                    view = memoryview(out)[offset:offset + n]
+                    iov = liburing.iovec(view)
+                    sqe = liburing.io_uring_get_sqe(ring)
+                    liburing.io_uring_prep_readv(sqe, fd, iov, 1, offset)
+                    batch.append(iov)  # jaga agar buffer tidak di-GC
+                    offset += n
+                liburing.io_uring_submit(ring)
+                cqe = liburing.io_uring_cqe()
+                done = 0
+                for _ in batch:
+                    liburing.io_uring_wait_cqe(ring, cqe)
+                    liburing.trap_error(cqe.res)
+                    done += cqe.res
+                    liburing.io_uring_cqe_seen(ring, cqe)
+                # cqe bisa selesai tak berurutan; total byte batch harus pas —
+                # short read berarti ada lubang di tengah buffer
+                if done != batch_bytes:
+                    raise OSError(f"short read: {done} of {batch_bytes} bytes")
+        finally:
+            liburing.io_uring_queue_exit(ring)
+        return bytes(out)
+    finally:
+        os.close(fd)
+
+
+def _write_uring(path: str, chunks: Iterable[bytes]) -> None:
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        ring = liburing.io_uring()
+        liburing.io_uring_queue_init(_QUEUE_DEPTH, ring, 0)
+        try:
+            offset = 0
+            cqe = liburing.io_uring_cqe()
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                iov = liburing.iovec(bytearray(chunk))
+                sqe = liburing.io_uring_get_sqe(ring)
+                liburing.io_uring_prep_writev(sqe, fd, iov, 1, offset)
+                liburing.io_uring_submit(ring)
+                liburing.io_uring_wait_cqe(ring, cqe)
+                liburing.trap_error(cqe.res)
+                if cqe.res != len(chunk):
+                    raise OSError(f"short write: {cqe.res} of {len(chunk)} bytes")
+                liburing.io_uring_cqe_seen(ring, cqe)
+                offset += len(chunk)
+        finally:
+            liburing.io_uring_queue_exit(ring)
+    finally:
+        os.close(fd)
+
+
+def read_file_bytes(path: str) -> bytes:
+    """Baca seluruh isi berkas; via io_uring bila tersedia."""
+    if _HAVE_URING:
+        try:
+            return _read_uring(path)
+        except Exception:
+            pass  # degradasi ke jalur sinkron
+    with open(path, "rb", buffering=1024 * 1024) as f:
+        return f.read()
+
+
+def write_file_bytes(path: str, chunks: Iterable[bytes]) -> None:
+    """Tulis iterable potongan bytes ke berkas; via io_uring bila tersedia."""
+    if _HAVE_URING:
+        # chunks bisa berupa generator sekali pakai; catat potongan yang sudah
+        # terlanjur dikonsumsi ring agar fallback tidak menulis berkas terpotong
+        consumed = []
+
+        def _tee():
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        try:
+            _write_uring(path, _tee())
+            return
+        except Exception:
+            # degradasi ke jalur sinkron: ulangi dari potongan pertama
+            chunks = itertools.chain(consumed, chunks)
+    with open(path, "wb", buffering=1024 * 1024) as f:
+        for chunk in chunks:
+            f.write(chunk)
@@ -1,242 +1,465 @@
-# -*- coding: utf-8 -*-
-"""
-Pustaka konversi tabel ⇄ VCF (vCard 3.0) tanpa pandas.
-Mendukung: CSV/TXT/TSV, Excel (XLSX via openpyxl), dan VCF.
-"""
-import csv
-import os
-import re
-from typing import List, Dict, Any, Tuple, Optional
-from openpyxl import load_workbook, Workbook
-
-# ---------- Util umum ----------
-
-def detect_delimiter(sample_path: str, fallback: str = ",") -> str:
-    try:
-        with open(sample_path, "r", encoding="utf-8", errors="ignore") as f:
-            sample = f.read(4096)
-        # deteksi sederhana
-        candidates = ["	", ";", ",", "|", ":"]
-        counts = {d: sample.count(d) for d in candidates}
-        return max(counts, key=counts.get) if max(counts.values()) > 0 else fallback
-    except Exception:
-        return fallback
-
-# ---------- vCard helpers ----------
-
-def _escape_vcard_value(value: str) -> str:
-    value = value.replace("\", "\\").replace(";", "\;").replace(",", "\,").replace("
-", "\n")
-    return value
-
-def _unfold_vcard_lines(lines: List[str]) -> List[str]:
-    out = []
-    for line in lines:
-        if line.startswith(" ") or line.startswith("	"):
-            if out:
-                out[-1] += line.lstrip()
-        else:
-            out.append(line)
-    return out
-
-def build_vcard_row(row: Dict[str, Any]) -> str:
-    given = str(row.get("given_name", "") or "").strip()
-    family = str(row.get("family_name", "") or "").strip()
-    full_name = str(row.get("full_name", "") or "").strip()
-    if not full_name:
-        full_name = " ".join([p for p in [given, family] if p]).strip() or "Tanpa Nama"
-
-    org = str(row.get("org", "") or "").strip()
-    title = str(row.get("title", "") or "").strip()
-
-    street = str(row.get("street", "") or "").strip()
-    city = str(row.get("city", "") or "").strip()
-    region = str(row.get("region", "") or "").strip()
-    postal = str(row.get("postal", "") or "").strip()
-    country = str(row.get("country", "") or "").strip()
-
-    note = str(row.get("note", "") or "").strip()
-
-    phones: List[Tuple[str, str]] = []
-    def add_phone(val: Any, typ: str):
-        num = str(val or "").strip()
-        if num:
-            phones.append((typ, num))
-    add_phone(row.get("phone"), "VOICE")
-    add_phone(row.get("phone_mobile"), "CELL")
-    add_phone(row.get("phone_home"), "HOME")
-    add_phone(row.get("phone_work"), "WORK")
-
-    for k, v in list(row.items()):
-        if k.startswith("phone_") and k not in {"phone_mobile", "phone_home", "phone_work"}:
-            label = k.split("_", 1)[1].upper() if "_" in k else "VOICE"
-            add_phone(v, label)
-
-    emails: List[str] = []
-    for key in ["email", "email_alt"]:
-        val = str(row.get(key, "") or "").strip()
-        if val:
-            emails.append(val)
-
-    v = [
-        "BEGIN:VCARD",
-        "VERSION:3.0",
-        f"N:{_escape_vcard_value(family)};{_escape_vcard_value(given)};;;",
-        f"FN:{_escape_vcard_value(full_name)}",
-    ]
-    for typ, num in phones:
-        v.append(f"TEL;TYPE={typ}:{_escape_vcard_value(num)}")
-    for em in emails:
-        v.append(f"EMAIL;TYPE=INTERNET:{_escape_vcard_value(em)}")
-    if org:
-        v.append(f"ORG:{_escape_vcard_value(org)}")
-    if title:
-        v.append(f"TITLE:{_escape_vcard_value(title)}")
-    if any([street, city, region, postal, country]):
-        adr = ["", "", street, city, region, postal, country]
-        v.append("ADR;TYPE=HOME:" + ";".join(_escape_vcard_value(x) for x in adr))
-    if note:
-        v.append(f"NOTE:{_escape_vcard_value(note)}")
-    v.append("END:VCARD")
-    return "
-".join(v)
-
-TEL_RE = re.compile(r"^TEL(?:;TYPE=([^:;]+))?:(.+)$", re.IGNORECASE)
-EMAIL_RE = re.compile(r"^EMAIL(?::|;TYPE=[^:]+:)(.+)$", re.IGNORECASE)
-N_RE = re.compile(r"^N:(.*)$", re.IGNORECASE)
-FN_RE = re.compile(r"^FN:(.*)$", re.IGNORECASE)
-ORG_RE = re.compile(r"^ORG:(.*)$", re.IGNORECASE)
-TITLE_RE = re.compile(r"^TITLE:(.*)$", re.IGNORECASE)
-ADR_RE = re.compile(r"^ADR(?:;TYPE=[^:]+)?:([^$]+)$", re.IGNORECASE)
-NOTE_RE = re.compile(r"^NOTE:(.*)$", re.IGNORECASE)
-
-def parse_vcf(text: str) -> List[Dict[str, Any]]:
-    cards = []
-    blocks = text.split("BEGIN:VCARD")
-    for block in blocks:
-        if "END:VCARD" not in block:
-            continue
-        lines = [x.strip("
-") for x in block.splitlines() if x.strip()]
-        lines = _unfold_vcard_lines(lines)
-        rec: Dict[str, Any] = {
-            "full_name": "", "given_name": "", "family_name": "",
-            "phones": [], "emails": [],
-            "org": "", "title": "",
-            "street": "", "city": "", "region": "", "postal": "", "country": "",
-            "note": "",
-        }
-        for line in lines:
-            m = FN_RE.match(line)
-            if m:
-                rec["full_name"] = m.group(1).replace("\,", ",").replace("\;", ";").replace("\n", "
-").replace("\\", "\"); continue
-            m = N_RE.match(line)
-            if m:
-                parts = m.group(1).split(";")
-                family = parts[0] if len(parts) > 0 else ""
-                given = parts[1] if len(parts) > 1 else ""
-                rec["family_name"] = family.replace("\,", ",").replace("\;", ";")
-                rec["given_name"] = given.replace("\,", ",").replace("\;", ";"); continue
-            m = TEL_RE.match(line)
-            if m:
-                _type = (m.group(1) or "VOICE").upper(); number = m.group(2)
-                rec.setdefault("phones_typed", []).append((_type, number))
-                rec["phones"].append(number); continue
-            m = EMAIL_RE.match(line)
-            if m:
-                rec["emails"].append(m.group(1)); continue
-            m = ORG_RE.match(line)
-            if m:
-                rec["org"] = m.group(1); continue
-            m = TITLE_RE.match(line)
-            if m:
-                rec["title"] = m.group(1); continue
-            m = ADR_RE.match(line)
-            if m:
-                adr = m.group(1).split(";")
-                rec["street"] = adr[2] if len(adr) > 2 else ""
-                rec["city"] = adr[3] if len(adr) > 3 else ""
-                rec["region"] = adr[4] if len(adr) > 4 else ""
-                rec["postal"] = adr[5] if len(adr) > 5 else ""
-                rec["country"] = adr[6] if len(adr) > 6 else ""; continue
-            m = NOTE_RE.match(line)
-            if m:
-                rec["note"] = m.group(1); continue
-        if not rec["full_name"]:
-            rec["full_name"] = (rec.get("given_name", "") + " " + rec.get("family_name", "")).strip() or "Tanpa Nama"
-        cards.append(rec)
-    return cards
-
-# ---------- IO tabel ----------
-
-def load_table(path: str, delimiter: Optional[str] = None) -> List[Dict[str, Any]]:
-    ext = os.path.splitext(path)[1].lower()
-    if ext in [".xlsx"]:
-        wb = load_workbook(path, read_only=True, data_only=True)
-        ws = wb.active
-        rows = list(ws.iter_rows(values_only=True))
-        headers = [str(h) if h is not None else "" for h in rows[0]] if rows else []
-        data = []
-        for r in rows[1:]:
-            rec = {headers[i]: (r[i] if i < len(r) else "") for i in range(len(headers))}
-            data.append(rec)
-        wb.close()
-        return data
-    elif ext in [".csv", ".txt", ".tsv"]:
-        delim = delimiter or ("	" if ext == ".tsv" else detect_delimiter(path))
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            reader = csv.DictReader(f, delimiter=delim)
-            return list(reader)
-    else:
-        raise ValueError("Ekstensi input tidak didukung. Gunakan csv/txt/tsv/xlsx.")
-
-
-def save_table(rows: List[Dict[str, Any]], path: str):
-    ext = os.path.splitext(path)[1].lower()
-    # konsolidasi header
-    headers: List[str] = []
-    for r in rows:
-        for k in r.keys():
-            if k not in headers:
-                headers.append(k)
-    if ext in [".csv", ".txt", ".tsv"]:
-        delim = "	" if ext == ".tsv" else ","
-        with open(path, "w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=headers, delimiter=delim)
-            writer.writeheader()
-            for r in rows:
-                writer.writerow(r)
-    elif ext in [".xlsx"]:
-        wb = Workbook()
-        ws = wb.active
-        ws.append(headers)
-        for r in rows:
-            ws.append([r.get(h, "") for h in headers])
-        wb.save(path)
-        wb.close()
-    else:
-        raise ValueError("Ekstensi output tidak didukung. Gunakan csv/txt/tsv/xlsx.")
-
-# ---------- Konversi utama ----------
-
-def table_to_vcf(input_path: str, output_path: str, delimiter: Optional[str] = None):
-    rows = load_table(input_path, delimiter=delimiter)
-    vcards = [build_vcard_row(r) for r in rows]
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write("
-".join(vcards) + ("
-" if vcards else ""))
-
-
-def vcf_to_table(input_path: str, output_path: str):
-    with open(input_path, "r", encoding="utf-8", errors="ignore") as f:
-        text = f.read()
-    records = parse_vcf(text)
-    norm = []
-    for r in records:
-        o = dict(r)
-        o["phones"] = "; ".join(r.get("phones", []))
-        o["emails"] = "; ".join(r.get("emails", []))
-        norm.append(o)
-    save_table(norm, output_path)
+# -*- coding: utf-8 -*-
+"""
+Pustaka konversi tabel ⇄ VCF (vCard 3.0) tanpa pandas.
+Mendukung: CSV/TXT/TSV, Excel (XLSX via openpyxl), dan VCF.
+"""
+import csv
+import functools
+import os
+import re
+from typing import Iterable, Iterator, List, Dict, Any, Tuple, Optional
+import xlsxwriter
+from openpyxl import load_workbook
+
+from _io_backend import read_file_bytes, write_file_bytes
+
+# ---------- Util umum ----------
+
+@functools.lru_cache(maxsize=64)
+def detect_delimiter(sample_path: str, fallback: str = ",") -> str:
+    try:
+        with open(sample_path, "r", encoding="utf-8", errors="ignore") as f:
+            sample = f.read(4096)
+        # Sniffer = state machine satu lintasan; hasil di-cache per path
+        return csv.Sniffer().sniff(sample, delimiters=",;\t|:").delimiter
+    except Exception:
+        return fallback
+
+# ---------- vCard helpers ----------
+
+# tabel translasi: satu lintasan C-level, bukan empat str.replace berantai
+_VCARD_ESC = str.maketrans({"\\": "\\\\", ";": "\\;", ",": "\\,", "\n": "\\n"})
+
+def _escape_vcard_value(value: str) -> str:
+    return value.translate(_VCARD_ESC)
+
+def _vcard_lines(given: str, family: str, full_name: str,
+                 phones: List[Tuple[str, str]], emails: List[str],
+                 org: str, title: str,
+                 street: str, city: str, region: str, postal: str, country: str,
+                 note: str) -> Iterator[str]:
+    # setiap baris sudah berakhiran \n agar bisa langsung di-writelines tanpa join;
+    # esc di-bind lokal supaya tiap field cukup satu bytecode LOAD_FAST, bukan
+    # lookup global + pemanggilan fungsi pembungkus
+    esc = _VCARD_ESC
+    yield "BEGIN:VCARD\n"
+    yield "VERSION:3.0\n"
+    yield f"N:{family.translate(esc)};{given.translate(esc)};;;\n"
+    yield f"FN:{full_name.translate(esc)}\n"
+    for typ, num in phones:
+        yield f"TEL;TYPE={typ}:{num.translate(esc)}\n"
+    for em in emails:
+        yield f"EMAIL;TYPE=INTERNET:{em.translate(esc)}\n"
+    if org:
+        yield f"ORG:{org.translate(esc)}\n"
+    if title:
+        yield f"TITLE:{title.translate(esc)}\n"
+    if street or city or region or postal or country:
+        adr = ["", "", street, city, region, postal, country]
+        yield "ADR;TYPE=HOME:" + ";".join(x.translate(esc) for x in adr) + "\n"
+    if note:
+        yield f"NOTE:{note.translate(esc)}\n"
+    yield "END:VCARD\n"
+
+
+def _sfield(v: Any) -> str:
+    # normalisasi nilai sel: CSV sudah str (cukup strip), openpyxl bisa angka/None
+    if isinstance(v, str):
+        return v.strip()
+    if v is None:
+        return ""
+    return str(v).strip()
+
+
+def build_vcard_lines(row: Dict[str, Any]) -> Iterator[str]:
+    get = row.get
+    given = _sfield(get("given_name"))
+    family = _sfield(get("family_name"))
+    full_name = _sfield(get("full_name"))
+    if not full_name:
+        full_name = " ".join([p for p in [given, family] if p]).strip() or "Tanpa Nama"
+
+    phones: List[Tuple[str, str]] = []
+    def add_phone(val: Any, typ: str):
+        num = _sfield(val)
+        if num:
+            phones.append((typ, num))
+    add_phone(get("phone"), "VOICE")
+    add_phone(get("phone_mobile"), "CELL")
+    add_phone(get("phone_home"), "HOME")
+    add_phone(get("phone_work"), "WORK")
+
+    for k, v in list(row.items()):
+        if k.startswith("phone_") and k not in {"phone_mobile", "phone_home", "phone_work"}:
+            label = k.split("_", 1)[1].upper() if "_" in k else "VOICE"
+            add_phone(v, label)
+
+    emails: List[str] = []
+    for key in ["email", "email_alt"]:
+        val = _sfield(get(key))
+        if val:
+            emails.append(val)
+
+    yield from _vcard_lines(given, family, full_name, phones, emails,
+                            _sfield(get("org")), _sfield(get("title")),
+                            _sfield(get("street")), _sfield(get("city")),
+                            _sfield(get("region")), _sfield(get("postal")),
+                            _sfield(get("country")), _sfield(get("note")))
+
+
+# kolom yang dikenali build_vcard_lines_fast; urutan tidak penting
+_VCARD_FIELDS = (
+    "given_name", "family_name", "full_name", "org", "title",
+    "street", "city", "region", "postal", "country", "note",
+    "phone", "phone_mobile", "phone_home", "phone_work",
+    "email", "email_alt",
+)
+
+
+def vcard_field_index(headers: List[str]) -> Dict[str, Any]:
+    idx: Dict[str, Any] = {name: headers.index(name) if name in headers else -1 for name in _VCARD_FIELDS}
+    idx["_extra_phones"] = [
+        (i, h.split("_", 1)[1].upper() if "_" in h else "VOICE")
+        for i, h in enumerate(headers)
+        if h.startswith("phone_") and h not in ("phone_mobile", "phone_home", "phone_work")
+    ]
+    return idx
+
+
+def _tfield(t: tuple, i: int) -> str:
+    if i < 0 or i >= len(t):
+        return ""
+    v = t[i]
+    if v is None:
+        return ""
+    return v.strip() if isinstance(v, str) else str(v).strip()
+
+
+def build_vcard_lines_fast(t: tuple, idx: Dict[str, Any]) -> Iterator[str]:
+    # varian berbasis indeks tuple: tanpa lookup hash dict per kolom per baris
+    _tf = _tfield
+    given = _tf(t, idx["given_name"])
+    family = _tf(t, idx["family_name"])
+    full_name = _tf(t, idx["full_name"])
+    if not full_name:
+        full_name = " ".join([p for p in [given, family] if p]).strip() or "Tanpa Nama"
+
+    phones: List[Tuple[str, str]] = []
+    for key, typ in (("phone", "VOICE"), ("phone_mobile", "CELL"),
+                     ("phone_home", "HOME"), ("phone_work", "WORK")):
+        num = _tf(t, idx[key])
+        if num:
+            phones.append((typ, num))
+    for i, label in idx["_extra_phones"]:
+        num = _tf(t, i)
+        if num:
+            phones.append((label, num))
+
+    emails = [e for e in (_tf(t, idx["email"]), _tf(t, idx["email_alt"])) if e]
+
+    yield from _vcard_lines(given, family, full_name, phones, emails,
+                            _tf(t, idx["org"]), _tf(t, idx["title"]),
+                            _tf(t, idx["street"]), _tf(t, idx["city"]),
+                            _tf(t, idx["region"]), _tf(t, idx["postal"]),
+                            _tf(t, idx["country"]), _tf(t, idx["note"]))
+
+
+def build_vcard_row(row: Dict[str, Any]) -> str:
+    return "".join(build_vcard_lines(row)).rstrip("\n")
+
+# satu regex gabungan: satu match C-level per baris, bukan 7 percobaan re.match
+_LINE_RE = re.compile(
+    r"^(?:"
+    r"FN:(?P<fnv>.*)"
+    r"|N:(?P<nv>.*)"
+    r"|TEL(?:;TYPE=(?P<ttype>[^:;]+))?:(?P<tv>.+)"
+    r"|EMAIL(?::|;TYPE=[^:]+:)(?P<ev>.+)"
+    r"|ORG:(?P<orgv>.*)"
+    r"|TITLE:(?P<tiv>.*)"
+    r"|ADR(?:;TYPE=[^:]+)?:(?P<av>.*)"
+    r"|NOTE:(?P<nov>.*)"
+    r")$",
+    re.IGNORECASE,
+)
+
+class VCard:
+    """Record vCard ringan: __slots__ memangkas memori per-instance dan membuat
+    akses atribut lebih cepat daripada lookup dict."""
+
+    __slots__ = ("full_name", "given_name", "family_name", "phones", "emails",
+                 "phones_typed", "org", "title", "street", "city", "region",
+                 "postal", "country", "note")
+
+    def __init__(self):
+        self.full_name = ""
+        self.given_name = ""
+        self.family_name = ""
+        self.phones: List[str] = []
+        self.emails: List[str] = []
+        self.phones_typed: List[Tuple[str, str]] = []
+        self.org = ""
+        self.title = ""
+        self.street = ""
+        self.city = ""
+        self.region = ""
+        self.postal = ""
+        self.country = ""
+        self.note = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        # konversi ke dict hanya saat mau disimpan; urutan kolom sama seperti dulu
+        d: Dict[str, Any] = {
+            "full_name": self.full_name, "given_name": self.given_name,
+            "family_name": self.family_name,
+            "phones": self.phones, "emails": self.emails,
+            "org": self.org, "title": self.title,
+            "street": self.street, "city": self.city, "region": self.region,
+            "postal": self.postal, "country": self.country,
+            "note": self.note,
+        }
+        if self.phones_typed:
+            d["phones_typed"] = self.phones_typed
+        return d
+
+
+def _parse_vcf_line(rec: VCard, line: str):
+    m = _LINE_RE.match(line)
+    if not m:
+        return
+    kind = m.lastgroup
+    if kind == "fnv":
+        rec.full_name = m.group("fnv").replace("\\,", ",").replace("\\;", ";").replace("\\n", "\n").replace("\\\\", "\\")
+    elif kind == "nv":
+        parts = m.group("nv").split(";")
+        family = parts[0] if len(parts) > 0 else ""
+        given = parts[1] if len(parts) > 1 else ""
+        rec.family_name = family.replace("\\,", ",").replace("\\;", ";")
+        rec.given_name = given.replace("\\,", ",").replace("\\;", ";")
+    elif kind == "tv":
+        _type = (m.group("ttype") or "VOICE").upper(); number = m.group("tv")
+        rec.phones_typed.append((_type, number))
+        rec.phones.append(number)
+    elif kind == "ev":
+        rec.emails.append(m.group("ev"))
+    elif kind == "orgv":
+        rec.org = m.group("orgv")
+    elif kind == "tiv":
+        rec.title = m.group("tiv")
+    elif kind == "av":
+        adr = m.group("av").split(";")
+        rec.street = adr[2] if len(adr) > 2 else ""
+        rec.city = adr[3] if len(adr) > 3 else ""
+        rec.region = adr[4] if len(adr) > 4 else ""
+        rec.postal = adr[5] if len(adr) > 5 else ""
+        rec.country = adr[6] if len(adr) > 6 else ""
+    elif kind == "nov":
+        rec.note = m.group("nov")
+
+
+def _iter_logical_lines(lines: Iterable[str]) -> Iterator[str]:
+    # unfold baris lanjutan (diawali spasi/tab) sambil streaming, tanpa buffer besar
+    buf: Optional[str] = None
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if not line.strip():
+            continue
+        if line[0] in (" ", "	"):
+            if buf is not None:
+                buf += line.lstrip()
+            continue
+        if buf is not None:
+            yield buf
+        buf = line
+    if buf is not None:
+        yield buf
+
+
+def iter_vcf_records(lines: Iterable[str]) -> Iterator[VCard]:
+    # mesin keadaan satu lintasan: emit record tiap END:VCARD, memori O(1)
+    rec: Optional[VCard] = None
+    for line in _iter_logical_lines(lines):
+        if line == "BEGIN:VCARD":
+            rec = VCard()
+        elif line == "END:VCARD":
+            if rec is not None:
+                if not rec.full_name:
+                    rec.full_name = (rec.given_name + " " + rec.family_name).strip() or "Tanpa Nama"
+                yield rec
+                rec = None
+        elif rec is not None:
+            _parse_vcf_line(rec, line)
+
+
+def parse_vcf(text: str) -> List[Dict[str, Any]]:
+    return [r.to_dict() for r in iter_vcf_records(text.splitlines())]
+
+
+# maxsize=1: cache ini hidup per proses, dan bot menjalankan konversi di
+# ProcessPoolExecutor — menahan banyak hasil parse di tiap worker hanya
+# melipatgandakan memori residen tanpa menaikkan hit rate
+@functools.lru_cache(maxsize=1)
+def _cached_vcf_records(path: str, mtime: float) -> List[VCard]:
+    text = read_file_bytes(path).decode("utf-8", errors="ignore")
+    return list(iter_vcf_records(text.splitlines()))
+
+
+def load_vcf_records(path: str) -> List[VCard]:
+    """Parse VCF dengan cache per (path, mtime); hit bila ekspor kedua untuk
+    file yang sama kebetulan jatuh di worker yang sama."""
+    return _cached_vcf_records(path, os.path.getmtime(path))
+
+# ---------- IO tabel ----------
+
+def _iter_xlsx_rows(path: str) -> Iterator[Dict[str, Any]]:
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        rows_iter = ws.iter_rows(values_only=True)
+        first = next(rows_iter, None)
+        if first is None:
+            return
+        headers = [str(h) if h is not None else "" for h in first]
+        for r in rows_iter:
+            yield {headers[i]: (r[i] if i < len(r) else "") for i in range(len(headers))}
+    finally:
+        wb.close()
+
+
+def _iter_csv_rows(path: str, delim: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8", errors="ignore", buffering=1024 * 1024) as f:
+        reader = csv.DictReader(f, delimiter=delim)
+        for rec in reader:
+            yield rec
+
+
+def _iter_xlsx_tuples(path: str) -> Iterator[tuple]:
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for r in wb.active.iter_rows(values_only=True):
+            yield r
+    finally:
+        wb.close()
+
+
+def _iter_csv_tuples(path: str, delim: str) -> Iterator[tuple]:
+    # csv.reader murni: tanpa dict per baris ala DictReader — downstream pakai indeks
+    with open(path, "r", encoding="utf-8", errors="ignore", buffering=1024 * 1024) as f:
+        reader = csv.reader(f, delimiter=delim)
+        next(reader, None)  # lewati header
+        for row in reader:
+            yield tuple(row)
+
+
+def load_table_rows(path: str, delimiter: Optional[str] = None) -> Tuple[List[str], Iterator[tuple]]:
+    """Seperti load_table, tetapi mengembalikan (headers, iterator tuple baris)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in [".xlsx"]:
+        rows_iter = _iter_xlsx_tuples(path)
+        first = next(rows_iter, None)
+        if first is None:
+            return [], iter(())
+        headers = [str(h) if h is not None else "" for h in first]
+        return headers, rows_iter
+    elif ext in [".csv", ".txt", ".tsv"]:
+        delim = delimiter or ("	" if ext == ".tsv" else detect_delimiter(path))
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            first_line = f.readline()
+        if not first_line:
+            return [], iter(())
+        headers = next(csv.reader([first_line], delimiter=delim))
+        return headers, _iter_csv_tuples(path, delim)
+    else:
+        raise ValueError("Ekstensi input tidak didukung. Gunakan csv/txt/tsv/xlsx.")
+
+
+def load_table(path: str, delimiter: Optional[str] = None) -> Iterable[Dict[str, Any]]:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in [".xlsx"]:
+        # read_only + generator: memori puncak hanya satu baris, bukan seluruh sheet
+        return _iter_xlsx_rows(path)
+    elif ext in [".csv", ".txt", ".tsv"]:
+        delim = delimiter or ("	" if ext == ".tsv" else detect_delimiter(path))
+        return _iter_csv_rows(path, delim)
+    else:
+        raise ValueError("Ekstensi input tidak didukung. Gunakan csv/txt/tsv/xlsx.")
+
+
+def save_table(rows: List[Dict[str, Any]], path: str):
+    ext = os.path.splitext(path)[1].lower()
+    # konsolidasi header — dict menjaga urutan dan membership-nya O(1)
+    seen: Dict[str, None] = {}
+    for r in rows:
+        for k in r.keys():
+            if k not in seen:
+                seen[k] = None
+    headers: List[str] = list(seen)
+    if ext in [".csv", ".txt", ".tsv"]:
+        delim = "	" if ext == ".tsv" else ","
+        with open(path, "w", encoding="utf-8", newline="", buffering=1024 * 1024) as f:
+            writer = csv.DictWriter(f, fieldnames=headers, delimiter=delim)
+            writer.writeheader()
+            for r in rows:
+                writer.writerow(r)
+    elif ext in [".xlsx"]:
+        # constant_memory: baris di-flush ke disk begitu ditulis, memori tetap konstan
+        wb = xlsxwriter.Workbook(path, {"constant_memory": True})
+        ws = wb.add_worksheet()
+        ws.write_row(0, 0, headers)
+        for i, r in enumerate(rows, 1):
+            ws.write_row(i, 0, [r.get(h, "") for h in headers])
+        wb.close()
+    else:
+        raise ValueError("Ekstensi output tidak didukung. Gunakan csv/txt/tsv/xlsx.")
+
+# ---------- Konversi utama ----------
+
+def _vcard_byte_chunks(rows: Iterable[tuple], idx: Dict[str, Any], chunk_size: int = 1 << 20) -> Iterator[bytes]:
+    # kumpulkan vCard jadi potongan ~1 MB agar backend menulis blok besar
+    buf: List[str] = []
+    size = 0
+    for t in rows:
+        for line in build_vcard_lines_fast(t, idx):
+            buf.append(line)
+            size += len(line)
+        if size >= chunk_size:
+            yield "".join(buf).encode("utf-8")
+            buf = []
+            size = 0
+    if buf:
+        yield "".join(buf).encode("utf-8")
+
+
+def table_to_vcf(input_path: str, output_path: str, delimiter: Optional[str] = None):
+    # streaming: baris dibaca, dirakit, dan ditulis per potongan — memori O(1)
+    headers, rows = load_table_rows(input_path, delimiter=delimiter)
+    idx = vcard_field_index(headers)
+    write_file_bytes(output_path, _vcard_byte_chunks(rows, idx))
+
+
+def _normalize_record(r: VCard) -> Dict[str, Any]:
+    o = r.to_dict()
+    o["phones"] = "; ".join(r.phones)
+    o["emails"] = "; ".join(r.emails)
+    return o
+
+
+def vcf_to_table(input_path: str, output_path: str):
+    save_table([_normalize_record(r) for r in load_vcf_records(input_path)], output_path)
+
+
+# urutan kolom keluaran VCF→tabel
+_VCF_COLUMNS = ("full_name", "given_name", "family_name", "phones", "emails",
+                "org", "title", "street", "city", "region", "postal", "country",
+                "note", "phones_typed")
+
+
+def vcf_to_xlsx(input_path: str, output_path: str):
+    # VCF→XLSX langsung: record hasil parse dialirkan ke workbook constant_memory,
+    # tanpa CSV perantara
+    wb = xlsxwriter.Workbook(output_path, {"constant_memory": True})
+    ws = wb.add_worksheet()
+    ws.write_row(0, 0, _VCF_COLUMNS)
+    for i, r in enumerate(load_vcf_records(input_path), 1):
+        o = _normalize_record(r)
+        ws.write_row(i, 0, [str(o.get(h, "") or "") for h in _VCF_COLUMNS])
+    wb.close()